@@ -28,14 +28,49 @@ class Region:
         )
 
 
+# The middle location is drawn about 1.2% of the board height above the side ones, so
+# its crop is shifted up to give all three the same layout for ``LOCATION_SLOTS``.
 REGIONS: dict[str, Region] = {
     "your_cards": Region(0.0, 0.75, 1.0, 0.890),
     "location1": Region(0.160, 0.215, 0.385, 0.760),
-    "location2": Region(0.385, 0.215, 0.610, 0.760),
+    "location2": Region(0.385, 0.203, 0.610, 0.748),
     "location3": Region(0.610, 0.215, 0.835, 0.760),
     "energy_turns": Region(0.420, 0.895, 1.0, 1.0),
 }
 
+LOCATION_SECTIONS: tuple[str, ...] = ("location1", "location2", "location3")
+
+# Bounds relative to a single location crop. Card rows are numbered outward from the
+# banner, matching the order the game fills them, and start at the top of the power
+# badges, which overhang the cards. Columns stay inside the glow drawn around a winning
+# location. The banner stops short of the power total badges above and below it so it
+# only changes when the location is revealed.
+LOCATION_SLOTS: dict[str, Region] = {
+    "banner": Region(0.100, 0.395, 0.900, 0.505),
+    "opponent1": Region(0.090, 0.140, 0.520, 0.305),
+    "opponent2": Region(0.500, 0.140, 0.915, 0.305),
+    "opponent3": Region(0.090, 0.000, 0.520, 0.140),
+    "opponent4": Region(0.500, 0.000, 0.915, 0.140),
+    "player1": Region(0.090, 0.625, 0.520, 0.790),
+    "player2": Region(0.500, 0.625, 0.915, 0.790),
+    "player3": Region(0.090, 0.790, 0.520, 0.965),
+    "player4": Region(0.500, 0.790, 0.915, 0.965),
+}
+
+# Power total badges of a location, which include location and ongoing effects.
+LOCATION_TOTALS: dict[str, Region] = {
+    "opponent_total": Region(0.360, 0.296, 0.640, 0.380),
+    "player_total": Region(0.360, 0.548, 0.640, 0.632),
+}
+
+# Digits of the power badge in the top-right corner of a card slot, relative to the slot
+# crop. Kept inside the badge so glow and foil effects around it are left out.
+CARD_POWER_REGION = Region(0.700, 0.045, 0.965, 0.245)
+
+# Digits inside a power total badge, relative to the total crop, leaving out the ring
+# drawn around the winning side's badge.
+TOTAL_DIGIT_REGION = Region(0.200, 0.280, 0.770, 0.880)
+
 
 def divide_screenshot(image_path: Path | str, output_dir: Path | str | None = None) -> Dict[str, Path]:
     """
@@ -74,5 +109,27 @@ def divide_screenshot(image_path: Path | str, output_dir: Path | str | None = No
     return saved_paths
 
 
+def divide_location(image: Image.Image) -> Dict[str, Image.Image]:
+    """
+    Split a location crop into its banner, card slots and power total badges.
+
+    Parameters
+    ----------
+    image:
+        A location crop as produced by :func:`divide_screenshot`.
+
+    Returns
+    -------
+    Dict[str, Image.Image]
+        Mapping of slot names from ``LOCATION_SLOTS`` and ``LOCATION_TOTALS`` to their
+        cropped images.
+    """
+    width, height = image.size
+    return {
+        name: image.crop(region.to_pixels(width, height))
+        for name, region in {**LOCATION_SLOTS, **LOCATION_TOTALS}.items()
+    }
+
+
 if __name__ == "__main__":
     divide_screenshot("screenshot.png")
@@ -4,14 +4,32 @@ from __future__ import annotations
 
 import base64
 import concurrent.futures
+import io
+import json
 import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterable, Mapping, Sequence, Set
 
 from openai import OpenAI
-
+from PIL import Image, ImageDraw, ImageFont
+
+from divide_screenshot import (
+    CARD_POWER_REGION,
+    LOCATION_SECTIONS,
+    LOCATION_SLOTS,
+    LOCATION_TOTALS,
+    TOTAL_DIGIT_REGION,
+    divide_location,
+)
 from read_card_abilities import load_card_abilities
+from slot_cache import (
+    SLOT_CACHE_FILENAME,
+    SlotCache,
+    SlotFingerprint,
+    SlotReading,
+    fingerprint,
+)
 
 SECTION_ORDER: Sequence[str] = (
     "your_cards",
@@ -29,6 +47,28 @@ PROMPTS: Mapping[str, str] = {
     "energy_turns": "What is the current energy and turn number?",
 }
 
+SLOT_PROMPT = (
+    "The image is a sheet of slots cropped from a Marvel Snap board, each captioned with "
+    "its number above it. The kind of every numbered slot is listed below. Card slots show "
+    "at most one card: give the card name and the power number shown on it, or null for "
+    "both if the slot is empty. Banner slots show a location: give the location name and "
+    "null power. Total slots show a location's power total badge: give null name and the "
+    "number on the badge as power. Respond with a JSON object mapping every slot number "
+    'to {"name": ..., "power": ...}.'
+)
+
+# Slot sheets are sent at high detail, which is billed per 512px tile, so packing every
+# pending slot into one sheet costs far less than a low-detail image per slot.
+SHEET_WIDTH = 1_024
+SHEET_PADDING = 6
+CAPTION_SCALE = 2
+
+LOCATION_NAMES: Mapping[str, str] = {
+    "location1": "left",
+    "location2": "middle",
+    "location3": "right",
+}
+
 SECTION_OUTPUTS: Mapping[str, str] = {
     "your_cards": "hand.txt",
     "energy_turns": "energyPower.txt",
@@ -84,6 +124,13 @@ def encode_image(image_path: Path) -> str:
     return base64.b64encode(data).decode("utf-8")
 
 
+def encode_pil_image(image: Image.Image) -> str:
+    """Return a base64-encoded PNG representation of an in-memory image."""
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
 def get_image_description(image_path: Path, section: str, client: OpenAI) -> str:
     """Request a textual description for a cropped board section."""
     base64_image = encode_image(image_path)
@@ -112,6 +159,293 @@ def get_image_description(image_path: Path, section: str, client: OpenAI) -> str
     return response.choices[0].message.content.strip()
 
 
+def slot_kind(slot: str) -> str:
+    """Return whether a slot name refers to a ``banner``, a ``total`` or a ``card``."""
+    if slot == "banner":
+        return "banner"
+    if slot in LOCATION_TOTALS:
+        return "total"
+    return "card"
+
+
+def parse_power(value: object) -> int | None:
+    """
+    Convert a power reported by the model into an integer.
+
+    Returns ``None`` when no power was given and raises ``ValueError`` for anything that
+    is not a whole number, including booleans.
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid power {value!r}.")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        return int(value.strip())
+    raise ValueError(f"Invalid power {value!r}.")
+
+
+def parse_slot_reading(slot: str, answer: object) -> SlotReading | None:
+    """
+    Validate the model's answer for one slot, returning ``None`` if it is unusable.
+
+    Only the fields a slot kind uses are checked: a total needs a power, a banner needs
+    a name, and a card needs both or, when the slot is empty, neither.
+    """
+    if not isinstance(answer, dict):
+        return None
+    kind = slot_kind(slot)
+
+    if kind != "total":
+        name = answer.get("name") or None
+        if name is not None and not isinstance(name, str):
+            return None
+        if kind == "banner":
+            return SlotReading(name) if name else None
+
+    try:
+        power = parse_power(answer.get("power"))
+    except ValueError:
+        return None
+
+    if kind == "total":
+        return SlotReading(None, power) if power is not None else None
+    if (name is None) != (power is None):
+        return None
+    return SlotReading(name, power)
+
+
+def compose_slot_sheet(images: Sequence[Image.Image]) -> Image.Image:
+    """
+    Tile slot crops into a single captioned sheet.
+
+    Tiles are laid out left to right, wrapping at ``SHEET_WIDTH``, and each is captioned
+    with its 1-based position so the model can refer to it by number.
+    """
+    font = ImageFont.load_default()
+    placements: list[tuple[int, int, Image.Image, Image.Image]] = []
+    x = y = row_height = sheet_width = 0
+
+    for number, image in enumerate(images, start=1):
+        left, top, right, bottom = font.getbbox(str(number))
+        caption = Image.new("RGB", (right + 4, bottom + 4), "white")
+        ImageDraw.Draw(caption).text((2, 2), str(number), fill="black", font=font)
+        caption = caption.resize(
+            (caption.width * CAPTION_SCALE, caption.height * CAPTION_SCALE),
+            Image.Resampling.NEAREST,
+        )
+
+        cell_width = max(image.width, caption.width)
+        if x and x + cell_width > SHEET_WIDTH:
+            x, y, row_height = 0, y + row_height + SHEET_PADDING, 0
+        placements.append((x, y, caption, image))
+        sheet_width = max(sheet_width, x + cell_width)
+        row_height = max(row_height, caption.height + image.height)
+        x += cell_width + SHEET_PADDING
+
+    sheet = Image.new("RGB", (max(sheet_width, 1), max(y + row_height, 1)), "white")
+    for left, top, caption, image in placements:
+        sheet.paste(caption, (left, top))
+        sheet.paste(image.convert("RGB"), (left, top + caption.height))
+    return sheet
+
+
+def recognize_slots(
+    slots: Sequence[tuple[str, Image.Image]],
+    client: OpenAI,
+) -> Dict[int, SlotReading]:
+    """
+    Recognize several slot crops with a single vision request.
+
+    The crops are tiled into one numbered sheet by :func:`compose_slot_sheet` and sent
+    as a single high-detail image alongside the kind of each numbered slot.
+
+    Parameters
+    ----------
+    slots:
+        Pairs of slot names from ``LOCATION_SLOTS`` or ``LOCATION_TOTALS`` and their crops.
+    client:
+        OpenAI client used for the request.
+
+    Returns
+    -------
+    Dict[int, SlotReading]
+        Readings keyed by position in ``slots``. Slots the model did not answer, or
+        answered with an unusable name or power, are omitted so they are retried on the
+        next run.
+
+    Raises
+    ------
+    RuntimeError
+        If the response is empty or is not a JSON object.
+    """
+    sheet = compose_slot_sheet([image for _, image in slots])
+    kinds = ", ".join(
+        f"{number}: {slot_kind(slot)}" for number, (slot, _) in enumerate(slots, start=1)
+    )
+    content = [
+        {"type": "text", "text": f"{SLOT_PROMPT}\n\nSlots: {kinds}"},
+        {
+            "type": "image_url",
+            "image_url": {
+                "url": f"data:image/png;base64,{encode_pil_image(sheet)}",
+                "detail": "high",
+            },
+        },
+    ]
+
+    response = client.chat.completions.create(
+        model="chatgpt-4o-latest",
+        messages=[{"role": "user", "content": content}],
+        max_tokens=2_000,
+        response_format={"type": "json_object"},
+    )
+    message = response.choices[0].message.content
+    if not message:
+        raise RuntimeError("Slot recognition returned an empty response.")
+    answers = json.loads(message)
+    if not isinstance(answers, dict):
+        raise RuntimeError(f"Slot recognition returned {type(answers).__name__}, not an object.")
+
+    readings: Dict[int, SlotReading] = {}
+    for index, (slot, _) in enumerate(slots):
+        reading = parse_slot_reading(slot, answers.get(str(index + 1)))
+        if reading is not None:
+            readings[index] = reading
+    return readings
+
+
+def format_location(section: str, readings: Mapping[str, SlotReading]) -> str:
+    """Render the slot readings of one location as a textual description."""
+    lines = [f"{LOCATION_NAMES[section].capitalize()} location: {readings['banner'].name}"]
+
+    for side, title in (("opponent", "Opponent"), ("player", "Player")):
+        total = readings[f"{side}_total"].power
+        cards = [
+            f"- {readings[slot].name} (power {readings[slot].power})"
+            for slot in LOCATION_SLOTS
+            if slot.startswith(side) and readings[slot].name
+        ]
+
+        if cards:
+            lines.append(f"{title} cards (total power {total}):")
+            lines.extend(cards)
+        else:
+            lines.append(f"{title} cards: none (total power {total})")
+
+    return "\n".join(lines)
+
+
+def describe_locations(
+    image_directory: Path,
+    client: OpenAI,
+    slot_cache: SlotCache,
+) -> Dict[str, str]:
+    """
+    Describe every location, sending only uncached slots to the vision model.
+
+    Each location crop is split into its banner, card slots and power total badges. The
+    totals are read from the screen because they include location and ongoing effects
+    that the card powers alone do not. Slots matching a cached fingerprint reuse the
+    stored reading; the remaining unique slots across all locations are recognized
+    together in one request and added to the cache. A location with any slot left
+    unrecognized falls back to a whole-image description, so a failed request only costs
+    the locations it affects.
+
+    Parameters
+    ----------
+    image_directory:
+        Directory containing the pre-cropped location images.
+    client:
+        OpenAI client used for recognizing new slots.
+    slot_cache:
+        Cache of previously recognized slots. Saved after new slots are recognized.
+
+    Returns
+    -------
+    Dict[str, str]
+        Mapping of location sections to their descriptions. Locations that could not
+        be described are omitted.
+    """
+    slot_keys: Dict[str, Dict[str, SlotFingerprint]] = {}
+    cached: Dict[str, Dict[str, SlotReading | None]] = {}
+    pending: Dict[SlotFingerprint, tuple[str, Image.Image]] = {}
+
+    for section in LOCATION_SECTIONS:
+        try:
+            with Image.open(image_directory / f"{section}.png") as image:
+                slots = divide_location(image)
+        except OSError as exc:
+            print(f"{section} generated an exception: {exc}")
+            continue
+
+        slot_keys[section] = {}
+        cached[section] = {}
+        for slot, slot_image in slots.items():
+            # Card art is matched loosely; power digits and total badges must match exactly.
+            detail = None
+            if slot in LOCATION_TOTALS:
+                detail = TOTAL_DIGIT_REGION.to_pixels(*slot_image.size)
+            elif slot != "banner":
+                detail = CARD_POWER_REGION.to_pixels(*slot_image.size)
+            key = fingerprint(slot_image, detail)
+            slot_keys[section][slot] = key
+            cached[section][slot] = slot_cache.get(key)
+            if cached[section][slot] is None and key not in pending:
+                pending[key] = (slot, slot_image)
+
+    total_slots = sum(len(keys) for keys in slot_keys.values())
+    print(f"Recognizing {len(pending)} of {total_slots} location slots.")
+
+    recognized: Dict[SlotFingerprint, SlotReading] = {}
+    if pending:
+        try:
+            readings = recognize_slots(list(pending.values()), client)
+        except Exception as exc:
+            print(f"Slot recognition generated an exception: {exc}")
+            readings = {}
+        for index, key in enumerate(pending):
+            if index in readings:
+                recognized[key] = readings[index]
+                slot_cache.put(key, readings[index])
+        try:
+            slot_cache.save()
+        except OSError as exc:
+            print(f"Saving the slot cache generated an exception: {exc}")
+
+    descriptions: Dict[str, str] = {}
+    for section, keys in slot_keys.items():
+        section_readings = {
+            slot: cached[section][slot] or recognized.get(key) for slot, key in keys.items()
+        }
+        missing = [slot for slot, reading in section_readings.items() if reading is None]
+        if not missing:
+            descriptions[section] = format_location(section, section_readings)
+            continue
+
+        print(f"Unrecognized slots in {section} ({', '.join(missing)}), describing it whole.")
+        try:
+            descriptions[section] = get_image_description(
+                image_directory / f"{section}.png",
+                section,
+                client,
+            )
+        except Exception as exc:
+            print(f"{section} generated an exception: {exc}")
+
+    return descriptions
+
+
+def save_description(image_directory: Path, section: str, description: str) -> None:
+    """Echo a section description and write it to the section's output file."""
+    print(f"Description for {section}:\n{description}\n")
+
+    output_name = SECTION_OUTPUTS.get(section)
+    if output_name:
+        (image_directory / output_name).write_text(description, encoding="utf-8")
+
+
 def extract_known_cards(text: str, card_names: Iterable[str]) -> Set[str]:
     """Detect referenced cards based on known card names."""
     lowered = text.lower()
@@ -122,6 +456,7 @@ def get_all_descriptions(
     image_directory: Path | str = Path("."),
     abilities_path: Path | str = Path("card_abilities.txt"),
     client: OpenAI | None = None,
+    slot_cache_path: Path | str | None = None,
 ) -> GameState:
     """
     Describe each saved board section and gather referenced card abilities.
@@ -134,6 +469,9 @@ def get_all_descriptions(
         Path to the ``card_abilities.txt`` reference file.
     client:
         Optional OpenAI client. If omitted, a client is created automatically.
+    slot_cache_path:
+        JSON file holding recognized location slots between runs. Defaults to
+        ``slot_cache.json`` inside ``image_directory``.
 
     Returns
     -------
@@ -143,6 +481,9 @@ def get_all_descriptions(
     image_directory = Path(image_directory)
     abilities_path = Path(abilities_path)
     client = client or get_openai_client()
+    if slot_cache_path is None:
+        slot_cache_path = image_directory / SLOT_CACHE_FILENAME
+    slot_cache = SlotCache(slot_cache_path)
 
     card_abilities = load_card_abilities(abilities_path)
     descriptions: Dict[str, str] = {}
@@ -156,25 +497,32 @@ def get_all_descriptions(
                 client,
             ): section
             for section in SECTION_ORDER
+            if section not in LOCATION_SECTIONS
         }
+        location_future = executor.submit(
+            describe_locations,
+            image_directory,
+            client,
+            slot_cache,
+        )
 
         for future in concurrent.futures.as_completed(futures):
             section = futures[future]
             try:
                 description = future.result()
                 descriptions[section] = description
-                print(f"Description for {section}:\n{description}\n")
-
-                output_name = SECTION_OUTPUTS.get(section)
-                if output_name:
-                    (image_directory / output_name).write_text(
-                        description,
-                        encoding="utf-8",
-                    )
+                save_description(image_directory, section, description)
 
             except Exception as exc:
                 print(f"{section} generated an exception: {exc}")
 
+        try:
+            for section, description in location_future.result().items():
+                descriptions[section] = description
+                save_description(image_directory, section, description)
+        except Exception as exc:
+            print(f"Locations generated an exception: {exc}")
+
     # Ensure deterministic order based on SECTION_ORDER
     ordered_descriptions = {
         section: descriptions[section]
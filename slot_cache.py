@@ -0,0 +1,149 @@
+"""Fingerprint-keyed cache of recognized location slots."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from PIL import Image
+
+ART_SIZE = (16, 20)
+# Mean absolute grayscale difference (0-255) up to which two slot thumbnails count as the
+# same art. Board glow and foil shimmer stay well below it; different cards do not.
+ART_TOLERANCE = 12.0
+MAX_ENTRIES = 2_048
+SLOT_CACHE_FILENAME = "slot_cache.json"
+
+
+@dataclass(frozen=True)
+class SlotReading:
+    """Recognized contents of a slot: a card and its power, or a location name."""
+
+    name: str | None
+    power: int | None = None
+
+
+@dataclass(frozen=True)
+class SlotFingerprint:
+    """Identity of a slot image: a coarse art thumbnail plus an exact detail hash."""
+
+    art: bytes
+    detail: str = ""
+
+
+def fingerprint(
+    image: Image.Image,
+    detail: tuple[int, int, int, int] | None = None,
+) -> SlotFingerprint:
+    """
+    Fingerprint a slot image for cache lookups.
+
+    Parameters
+    ----------
+    image:
+        The slot crop. Its art is reduced to a small grayscale thumbnail that is matched
+        within ``ART_TOLERANCE``, so animated board effects do not force a new lookup.
+    detail:
+        Optional pixel box within ``image``, such as the power badge, that is hashed at
+        full resolution and must match exactly.
+
+    Returns
+    -------
+    SlotFingerprint
+        Thumbnail bytes and the detail hash (empty when ``detail`` is omitted).
+    """
+    thumbnail = image.convert("L").resize(ART_SIZE, Image.Resampling.BOX)
+    detail_hash = ""
+    if detail is not None:
+        detail_hash = hashlib.sha1(image.convert("RGB").crop(detail).tobytes()).hexdigest()
+    return SlotFingerprint(thumbnail.tobytes(), detail_hash)
+
+
+def art_distance(first: bytes, second: bytes) -> float:
+    """Return the mean absolute difference between two art thumbnails."""
+    if len(first) != len(second):
+        return float("inf")
+    return sum(abs(a - b) for a, b in zip(first, second, strict=True)) / len(first)
+
+
+class SlotCache:
+    """
+    Persistent least-recently-used mapping of slot fingerprints to readings.
+
+    Parameters
+    ----------
+    path:
+        JSON file used to persist the cache between runs.
+    max_entries:
+        Number of readings retained before the least recently used are evicted.
+    tolerance:
+        Largest ``art_distance`` at which a cached fingerprint still matches.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        max_entries: int = MAX_ENTRIES,
+        tolerance: float = ART_TOLERANCE,
+    ) -> None:
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.tolerance = tolerance
+        self._entries: OrderedDict[SlotFingerprint, SlotReading] = OrderedDict()
+
+        if self.path.exists():
+            try:
+                raw = json.loads(self.path.read_text(encoding="utf-8"))
+                for entry in raw:
+                    key = SlotFingerprint(bytes.fromhex(entry["art"]), entry["detail"])
+                    self._entries[key] = SlotReading(entry["name"], entry["power"])
+            except (ValueError, KeyError, TypeError) as exc:
+                print(f"Ignoring unreadable slot cache {self.path}: {exc}")
+                self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: SlotFingerprint) -> SlotReading | None:
+        """
+        Return the reading for the closest cached fingerprint, marking it as recently used.
+
+        A match needs an identical detail hash and art within ``tolerance``.
+        """
+        match = key if key in self._entries else None
+        if match is None:
+            best_distance = self.tolerance
+            for candidate in self._entries:
+                if candidate.detail != key.detail:
+                    continue
+                distance = art_distance(candidate.art, key.art)
+                if distance <= best_distance:
+                    match, best_distance = candidate, distance
+
+        if match is None:
+            return None
+        self._entries.move_to_end(match)
+        return self._entries[match]
+
+    def put(self, key: SlotFingerprint, reading: SlotReading) -> None:
+        """Store a reading, evicting the least recently used entries when full."""
+        self._entries[key] = reading
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def save(self) -> None:
+        """Write the cache to ``path``, least recently used first."""
+        data = [
+            {
+                "art": key.art.hex(),
+                "detail": key.detail,
+                "name": reading.name,
+                "power": reading.power,
+            }
+            for key, reading in self._entries.items()
+        ]
+        self.path.write_text(json.dumps(data, indent=2), encoding="utf-8")
@@ -0,0 +1,42 @@
+"""Tests for parsing slot recognition answers."""
+
+from __future__ import annotations
+
+import pytest
+
+from gpt_interaction import parse_power, parse_slot_reading
+from slot_cache import SlotReading
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [(None, None), (5, 5), ("5", 5), (" -2 ", -2), ("+3", 3)],
+)
+def test_parse_power_accepts_whole_numbers(value: object, expected: int | None) -> None:
+    assert parse_power(value) == expected
+
+
+@pytest.mark.parametrize("value", [True, False, "five", "", 5.5, [5]])
+def test_parse_power_rejects_other_values(value: object) -> None:
+    with pytest.raises(ValueError):
+        parse_power(value)
+
+
+@pytest.mark.parametrize(
+    ("slot", "answer", "expected"),
+    [
+        ("player1", {"name": "Klaw", "power": "6"}, SlotReading("Klaw", 6)),
+        ("player1", {"name": None, "power": None}, SlotReading(None)),
+        ("player1", {"name": "Klaw", "power": True}, None),
+        ("player1", {"name": "Klaw", "power": None}, None),
+        ("player1", {"name": None, "power": 6}, None),
+        ("opponent2", {"name": 7, "power": 6}, None),
+        ("banner", {"name": "Oscorp Tower", "power": "n/a"}, SlotReading("Oscorp Tower")),
+        ("banner", {"name": None, "power": None}, None),
+        ("player_total", {"name": "Total", "power": "21"}, SlotReading(None, 21)),
+        ("opponent_total", {"name": None, "power": None}, None),
+        ("player1", ["Klaw", 6], None),
+    ],
+)
+def test_parse_slot_reading(slot: str, answer: object, expected: SlotReading | None) -> None:
+    assert parse_slot_reading(slot, answer) == expected
@@ -0,0 +1,81 @@
+"""Tests for the slot fingerprint cache."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+from slot_cache import (
+    ART_SIZE,
+    ART_TOLERANCE,
+    SlotCache,
+    SlotFingerprint,
+    SlotReading,
+    art_distance,
+    fingerprint,
+)
+
+ART_LENGTH = ART_SIZE[0] * ART_SIZE[1]
+
+
+def make_key(level: int, detail: str = "badge") -> SlotFingerprint:
+    return SlotFingerprint(bytes([level]) * ART_LENGTH, detail)
+
+
+def test_put_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = SlotCache(tmp_path / "cache.json", max_entries=2)
+    first, second, third = make_key(0), make_key(100), make_key(200)
+
+    cache.put(first, SlotReading("Klaw", 4))
+    cache.put(second, SlotReading("Ant-Man", 1))
+    assert cache.get(first) == SlotReading("Klaw", 4)  # refreshes ``first``
+    cache.put(third, SlotReading("Armor", 5))
+
+    assert len(cache) == 2
+    assert cache.get(second) is None
+    assert cache.get(first) == SlotReading("Klaw", 4)
+    assert cache.get(third) == SlotReading("Armor", 5)
+
+
+def test_save_and_reload_keeps_readings_and_order(tmp_path: Path) -> None:
+    path = tmp_path / "cache.json"
+    cache = SlotCache(path, max_entries=2)
+    cache.put(make_key(0), SlotReading("Klaw", 4))
+    cache.put(make_key(100), SlotReading(None))
+    cache.put(make_key(200, detail=""), SlotReading("Oscorp Tower"))
+    cache.save()
+
+    reloaded = SlotCache(path, max_entries=2)
+    assert len(reloaded) == 2
+    assert reloaded.get(make_key(0)) is None
+    assert reloaded.get(make_key(100)) == SlotReading(None)
+    assert reloaded.get(make_key(200, detail="")) == SlotReading("Oscorp Tower")
+
+
+def test_unreadable_cache_file_starts_empty(tmp_path: Path) -> None:
+    path = tmp_path / "cache.json"
+    path.write_text('{"old": {"name": "Klaw", "power": 4}}', encoding="utf-8")
+
+    assert len(SlotCache(path)) == 0
+
+
+def test_get_matches_art_within_tolerance_only(tmp_path: Path) -> None:
+    cache = SlotCache(tmp_path / "cache.json", tolerance=12.0)
+    cache.put(make_key(100), SlotReading("Klaw", 4))
+
+    assert cache.get(make_key(110)) == SlotReading("Klaw", 4)
+    assert cache.get(make_key(113)) is None
+    assert cache.get(make_key(100, detail="other badge")) is None
+
+
+def test_fingerprint_detail_changes_with_badge_pixels() -> None:
+    image = Image.new("RGB", (100, 120), (40, 40, 60))
+    badge = (70, 0, 100, 30)
+    changed = image.copy()
+    ImageDraw.Draw(changed).point((85, 15), fill=(255, 255, 255))
+
+    original_key, changed_key = fingerprint(image, badge), fingerprint(changed, badge)
+    assert art_distance(original_key.art, changed_key.art) <= ART_TOLERANCE
+    assert original_key.detail != changed_key.detail
+    assert fingerprint(image).detail == ""